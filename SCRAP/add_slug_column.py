@@ -1,14 +1,53 @@
 import os
-import json
+import functools
+import time
+import hashlib
+import tempfile
 import requests
-from urllib.parse import urlparse
 from dotenv import load_dotenv
+from turso_client import get_client, result_rows, result_error
 
-def ensure_slug_column():
-    """Ensure the blog_posts table has a slug column"""
-    # Load environment variables from .env file in the parent directory
+# The schema only changes once per deployment, so remember a successful check
+# in-process and in a sentinel file that expires after SCHEMA_CACHE_TTL seconds
+SCHEMA_CACHE_TTL = 24 * 60 * 60
+_SCHEMA_VERIFIED = set()
+
+def _schema_sentinel_path(db_url: str) -> str:
+    """Path of the sentinel file marking the schema as verified for db_url"""
+    digest = hashlib.sha256(db_url.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(tempfile.gettempdir(), f"turso_schema_ok_{digest}")
+
+def _schema_verified(db_url: str) -> bool:
+    """Check whether the slug column was already verified recently"""
+    if db_url in _SCHEMA_VERIFIED:
+        return True
+    try:
+        if time.time() - os.path.getmtime(_schema_sentinel_path(db_url)) < SCHEMA_CACHE_TTL:
+            _SCHEMA_VERIFIED.add(db_url)
+            return True
+    except OSError:
+        pass
+    return False
+
+def _mark_schema_verified(db_url: str) -> None:
+    """Remember that the slug column exists for db_url"""
+    _SCHEMA_VERIFIED.add(db_url)
+    try:
+        with open(_schema_sentinel_path(db_url), 'w', encoding='utf-8') as f:
+            f.write(db_url)
+    except OSError as e:
+        print(f"Warning: could not write schema sentinel: {e}")
+
+@functools.lru_cache(maxsize=1)
+def _ensure_env_loaded() -> bool:
+    """Load the .env file from the parent directory once per process"""
     env_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), '.env')
     load_dotenv(env_path)
+    return True
+
+def ensure_slug_column():
+    """Ensure the blog_posts table has a slug column"""
+    _ensure_env_loaded()
     
     try:
         # Get database URL and auth token from environment variables
@@ -19,19 +58,13 @@ def ensure_slug_column():
             print("Error: Please set TURSO_DATABASE_URL and TURSO_AUTH_TOKEN environment variables")
             return False
             
-        # Convert libsql:// URL to https:// for API calls
-        if db_url.startswith('libsql://'):
-            db_url = f"https://{db_url[9:]}"
-        
-        pipeline_url = f"{db_url}/v2/pipeline"
+        client = get_client(db_url, auth_token)
         
-        headers = {
-            'Authorization': f"Bearer {auth_token}",
-            'Content-Type': 'application/json',
-            'User-Agent': 'Turso-Slug-Column-Update/1.0'
-        }
+        if _schema_verified(client.url):
+            print("✅ 'slug' column already verified, skipping schema check")
+            return True
         
-        # First, ensure the table exists
+        # Create the table (if needed) and read its columns in a single pipeline call
         create_table_sql = """
         CREATE TABLE IF NOT EXISTS blog_posts (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -43,80 +76,39 @@ def ensure_slug_column():
         );
         """.strip()
         
-        create_payload = {
-            'requests': [
-                {'type': 'execute', 'stmt': {'sql': create_table_sql}},
-                {'type': 'close'}
-            ]
-        }
-        
-        print(f"Connecting to database at: {db_url}")
+        print(f"Connecting to database at: {client.url}")
         print("Checking database...")
         
-        check_response = requests.post(
-            pipeline_url,
-            headers=headers,
-            json=create_payload,
-            timeout=30
-        )
-        
-        if check_response.status_code != 200:
-            print(f"Error checking database: {check_response.status_code} - {check_response.text}")
+        try:
+            results = client.execute([
+                {'sql': create_table_sql},
+                {'sql': 'PRAGMA table_info(blog_posts);'}
+            ])
+        except requests.exceptions.RequestException as e:
+            print(f"Error checking database: {e}")
             return False
-            
-        response_data = check_response.json()
         
-        # Check if table exists
-        table_exists = len(response_data['results'][0]['response']['result']['rows']) > 0
-        if not table_exists:
-            print("ℹ️ 'blog_posts' table not found, creating it...")
-            create_table_sql = """
-            CREATE TABLE IF NOT EXISTS blog_posts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                content TEXT NOT NULL,
-                slug TEXT UNIQUE,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-            """.strip()
-            
-            create_payload = {
-                'requests': [
-                    {'type': 'execute', 'stmt': {'sql': create_table_sql}},
-                    {'type': 'close'}
-                ]
-            }
-            
-            create_response = requests.post(
-                pipeline_url,
-                headers=headers,
-                json=create_payload,
-                timeout=30
-            )
-            
-            if create_response.status_code != 200:
-                print(f"❌ Failed to create blog_posts table: {create_response.status_code} - {create_response.text}")
-                return False
-                
-            print("✅ Successfully created 'blog_posts' table with 'slug' column")
-            return True
-            
-        # If table exists, check if slug column exists
-        columns = [col[1] for col in response_data['results'][1]['response']['result']['rows']]
+        # Check if slug column exists
+        columns = [row[1] for row in result_rows(results[1])]
         if 'slug' in columns:
             print("✅ 'slug' column already exists in blog_posts table")
+            _mark_schema_verified(client.url)
             return True
             
         print("ℹ️ 'slug' column not found in blog_posts table. Adding it now...")
-        # Call add_slug_column directly
-        return add_slug_column()
+        if not add_slug_column():
+            return False
+        
+        _mark_schema_verified(client.url)
+        return True
         
     except Exception as e:
         print(f"Error: {str(e)}")
         return False
 
 def add_slug_column():
+    _ensure_env_loaded()
+    
     try:
         # Get database URL and auth token from environment variables
         db_url = os.getenv('TURSO_DATABASE_URL')
@@ -126,66 +118,25 @@ def add_slug_column():
             print("Error: Please set TURSO_DATABASE_URL and TURSO_AUTH_TOKEN environment variables")
             return False
             
-        # Convert libsql:// URL to https:// for API calls
-        if db_url.startswith('libsql://'):
-            db_url = f"https://{db_url[9:]}"
-        
-        pipeline_url = f"{db_url}/v2/pipeline"
-        
-        headers = {
-            'Authorization': f"Bearer {auth_token}",
-            'Content-Type': 'application/json',
-            'User-Agent': 'Turso-Slug-Column-Update/1.0'
-        }
-        
-        # Check if slug column exists
-        check_sql = "PRAGMA table_info(blog_posts);"
-        
-        check_payload = {
-            'requests': [
-                {'type': 'execute', 'stmt': {'sql': check_sql}},
-                {'type': 'close'}
-            ]
-        }
+        client = get_client(db_url, auth_token)
         
-        check_response = requests.post(
-            pipeline_url,
-            headers=headers,
-            json=check_payload,
-            timeout=30
-        )
-        
-        if check_response.status_code != 200:
-            print(f"Error checking database: {check_response.status_code} - {check_response.text}")
-            return False
-            
-        response_data = check_response.json()
-        columns = [col[1] for col in response_data['results'][0]['response']['result']['rows']]
-        
-        if 'slug' in columns:
-            print("✅ 'slug' column already exists in blog_posts table")
-            return True
-            
-        # Add slug column
+        # Try the ALTER straight away; SQLite rejects it with a "duplicate
+        # column name" error when the column is already there
         print("ℹ️ Adding 'slug' column to blog_posts table...")
         alter_sql = "ALTER TABLE blog_posts ADD COLUMN slug TEXT UNIQUE;"
         
-        alter_payload = {
-            'requests': [
-                {'type': 'execute', 'stmt': {'sql': alter_sql}},
-                {'type': 'close'}
-            ]
-        }
-        
-        alter_response = requests.post(
-            pipeline_url,
-            headers=headers,
-            json=alter_payload,
-            timeout=30
-        )
-        
-        if alter_response.status_code != 200:
-            print(f"❌ Failed to add 'slug' column: {alter_response.status_code} - {alter_response.text}")
+        # Statement errors may come back as an HTTP error or inside a 200 body
+        try:
+            result = client.execute([{'sql': alter_sql}])[0]
+            error = result_error(result) if result.get('type') == 'error' else None
+        except requests.exceptions.HTTPError as e:
+            error = f"{e.response.status_code} - {e.response.text}"
+        
+        if error is not None:
+            if 'duplicate column name: slug' in error:
+                print("✅ 'slug' column already exists in blog_posts table")
+                return True
+            print(f"❌ Failed to add 'slug' column: {error}")
             return False
             
         print("✅ Successfully added 'slug' column to blog_posts table")
@@ -196,10 +147,8 @@ def add_slug_column():
         return False
 
 def main():
-    # First ensure the table exists
-    if ensure_slug_column():
-        # Then ensure the slug column exists
-        add_slug_column()
+    # Creates the table if needed and adds the slug column when missing
+    ensure_slug_column()
 
 if __name__ == "__main__":
     main()
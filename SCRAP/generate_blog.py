@@ -1,11 +1,33 @@
 import os
+import re
+import logging
+import mmap
 import sys
 import json
+import functools
 import requests
+from html.parser import HTMLParser
 from typing import List, Dict, Optional, Tuple
 import google.generativeai as genai
 from dotenv import load_dotenv
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from unidecode import unidecode
+from turso_client import get_client, result_rows, result_error
+
+log = logging.getLogger(__name__)
+
+# Patterns used by generate_slug, compiled once
+_SLUG_STRIP = re.compile(r'[^\w\s-]')
+_SLUG_DASH = re.compile(r'[\s-]+')
+
+# Upper bound of raw HTML read per scraped page; the visible text extracted
+# from it is then cut to 10k characters
+MAX_SCRAPED_BYTES = 512 * 1024
+
+# Patterns used by parse_blog_content to find the title line
+_META_TITLE_RE = re.compile(r'^[ \t]*\*\*Meta Title:\*\*[ \t]*(\S.*)$', re.MULTILINE)
+_H1_RE = re.compile(r'^[ \t]*# [ \t]*(\S.*)$', re.MULTILINE)
 
 def load_search_results(json_file: str) -> Dict:
     """Load search results from JSON file"""
@@ -16,18 +38,51 @@ def load_search_results(json_file: str) -> Dict:
         print(f"Error loading search results: {e}")
         return {}
 
-def load_scraped_content(base_filename: str, count: int = 2) -> List[Dict]:
-    """Load scraped content from HTML files"""
+class _TextExtractor(HTMLParser):
+    """Collects the visible text of an HTML document"""
+    _SKIP_TAGS = {'script', 'style', 'noscript', 'template', 'svg'}
+    
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+        self._skip_depth = 0
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in self._SKIP_TAGS:
+            self._skip_depth += 1
+    
+    def handle_endtag(self, tag):
+        if tag in self._SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+    
+    def handle_data(self, data):
+        if not self._skip_depth:
+            text = data.strip()
+            if text:
+                self.parts.append(text)
+
+def html_to_text(html: str) -> str:
+    """Strip tags, scripts and styles so only readable text is kept"""
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    return ' '.join(parser.parts)
+
+def load_scraped_content(base_filename: str, count: int = 2, directory: str = '.') -> List[Dict]:
+    """Load scraped content from HTML files in directory"""
     contents = []
     for i in range(1, count + 1):
         try:
             filename = f"scraped_{base_filename}_link_{i}.html"
-            with open(filename, 'r', encoding='utf-8') as f:
-                contents.append({
-                    'position': i,
-                    'filename': filename,
-                    'content': f.read()[:10000]  # Limit content length
-                })
+            # Bounded read so large pages never enter memory in full
+            with open(os.path.join(directory, filename), 'rb') as f:
+                html = f.read(MAX_SCRAPED_BYTES).decode('utf-8', 'replace')
+            contents.append({
+                'position': i,
+                'filename': filename,
+                # Limit text length (not HTML) so the budget goes to real content
+                'content': html_to_text(html)[:10000]
+            })
         except Exception as e:
             print(f"Error loading scraped content {i}: {e}")
     return contents
@@ -45,17 +100,30 @@ def list_available_models():
         print(f"Error listing models: {e}")
         return []
 
+@functools.lru_cache(maxsize=1)
+def _get_gemini_model(api_key: str):
+    """Configure Gemini and build the model once per API key"""
+    genai.configure(api_key=api_key)
+    # Use the latest available model
+    return genai.GenerativeModel('gemini-2.5-pro')
+
 def generate_blog_post(search_results: Dict, scraped_contents: List[Dict]) -> str:
     """Generate blog post content using Gemini AI"""
     # Extract search query and top results
-    query = search_results.get('search_parameters', {}).get('q', 'the topic')
+    params = search_results.get('search_parameters') or {}
+    query = params.get('q', 'the topic')
+    organics = (search_results.get('organic_results') or [])[:5]
     top_results = "\n".join(
-        f"{i+1}. {res.get('title', '')} - {res.get('link', '')}"
-        for i, res in enumerate(search_results.get('organic_results', [])[:5])
+        f"{i}. {res.get('title', '')} - {res.get('link', '')}"
+        for i, res in enumerate(organics, 1)
+    )
+    
+    sources = "\n\n".join(
+        f"--- Source {c['position']} ({c['filename']}) ---\n{c['content']}"
+        for c in scraped_contents
     )
     
     # Get current year
-    from datetime import datetime
     current_year = datetime.now().year
     
     # Prepare the prompt
@@ -74,7 +142,7 @@ def generate_blog_post(search_results: Dict, scraped_contents: List[Dict]) -> st
     {top_results}
     
     Scraped Content (first 10k chars each):
-    {json.dumps(scraped_contents, indent=2)}
+    {sources}
     
     Required Structure:
     1. Start directly with the meta title and meta description (formatted as shown below)
@@ -101,11 +169,7 @@ def generate_blog_post(search_results: Dict, scraped_contents: List[Dict]) -> st
     """
     
     try:
-        # Initialize Gemini with the specific model
-        genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
-        
-        # Use the latest available model
-        model = genai.GenerativeModel('gemini-2.5-pro')
+        model = _get_gemini_model(os.getenv('GEMINI_API_KEY'))
         
         # Generate content with error handling
         response = model.generate_content(prompt)
@@ -123,8 +187,9 @@ def generate_blog_post(search_results: Dict, scraped_contents: List[Dict]) -> st
         print(f"Error generating blog post: {e}")
         return ""
 
+@functools.lru_cache(maxsize=1)
 def load_environment() -> bool:
-    """Load environment variables from .env file"""
+    """Load environment variables from .env file (only once per process)"""
     # Load from .env in current directory (same as test_turso.py)
     if load_dotenv():
         print("Loaded environment variables from .env")
@@ -140,63 +205,99 @@ def load_environment() -> bool:
     print("Warning: No .env file found")
     return False
 
-def main():
-    # Set console encoding to UTF-8 for Windows
-    if sys.platform == 'win32':
-        import io
-        # Use the existing sys module instead of reimporting
-        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+def write_text_file(path: str, text: str) -> None:
+    """Write text to path as UTF-8"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+def configure_logging() -> None:
+    """Send log records to stdout as plain messages.
+    
+    The level comes from LOG_LEVEL (default INFO); set LOG_LEVEL=DEBUG to
+    see the request/response diagnostics of save_to_database.
+    """
+    if log.handlers:
+        return
+    # Replace characters the console cannot encode instead of failing
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(errors='replace')
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    log.addHandler(handler)
+    log.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+    log.propagate = False
+
+def run(keyword: str, scrap_dir: str = '.') -> bool:
+    """Generate the blog post for keyword from the files in scrap_dir.
+    
+    Returns:
+        True if the post was generated and saved to the database
+    """
+    configure_logging()
     
     # Load environment variables
     if not load_environment() or not os.getenv('GEMINI_API_KEY'):
-        safe_print("Error: GEMINI_API_KEY not found in environment variables")
+        log.error("Error: GEMINI_API_KEY not found in environment variables")
         print("Please add your Gemini API key to either:")
         print("1. .env file in the SCRAP directory")
         print("2. .env.local file in the parent directory")
         print("\nExample content:")
         print("GEMINI_API_KEY=your_api_key_here")
-        return
-    
-    # Get keyword from command line arguments
-    if len(sys.argv) < 2:
-        print("Error: Please provide a keyword as a command line argument")
-        print("Usage: python generate_blog.py KEYWORD")
-        return
+        return False
     
-    keyword = sys.argv[1].upper().replace(' ', '_')
+    keyword = keyword.upper().replace(' ', '_')
     print(f"Processing keyword: {keyword}")
     
     # File paths
-    results_file = f"{keyword}_results.json"
+    results_file = os.path.join(scrap_dir, f"{keyword}_results.json")
     
     # Load data
     search_results = load_search_results(results_file)
     if not search_results:
         print("No search results found.")
-        return
+        return False
     
-    scraped_contents = load_scraped_content(keyword)
+    scraped_contents = load_scraped_content(keyword, directory=scrap_dir)
     if not scraped_contents:
         print("No scraped content found.")
-        return
+        return False
     
     # Generate blog post
     print("Generating blog post...")
     blog_content = generate_blog_post(search_results, scraped_contents)
     
-    # Save the blog post to a file
-    output_file = f"blog_post_{keyword}.md"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(blog_content)
+    output_file = os.path.join(scrap_dir, f"blog_post_{keyword}.md")
     
     # Extract title and content for the API
     title, content = parse_blog_content(blog_content)
     
-    # Save to database via API
-    if save_to_database(keyword, title, content, blog_content):
-        safe_print("[SUCCESS] Blog post generated and saved to database successfully!")
+    # Save the blog post to a file in the background while the database
+    # request is in flight
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        write_future = executor.submit(write_text_file, output_file, blog_content)
+        saved = save_to_database(keyword, title, content, blog_content)
+        write_future.result()
+    
+    if saved:
+        log.info("[SUCCESS] Blog post generated and saved to database successfully!")
     else:
-        safe_print(f"[WARNING] Blog post generated and saved to {output_file}, but failed to save to database")
+        log.warning("[WARNING] Blog post generated and saved to %s, but failed to save to database", output_file)
+    return saved
+
+def main():
+    # Set console encoding to UTF-8 for Windows
+    if sys.platform == 'win32':
+        import io
+        # Use the existing sys module instead of reimporting
+        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    
+    # Get keyword (and optional scrap directory) from command line arguments
+    if len(sys.argv) < 2:
+        print("Error: Please provide a keyword as a command line argument")
+        print("Usage: python generate_blog.py KEYWORD [SCRAP_DIR]")
+        return
+    
+    run(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else '.')
 
 def parse_blog_content(blog_content: str) -> Tuple[str, str]:
     """
@@ -204,55 +305,26 @@ def parse_blog_content(blog_content: str) -> Tuple[str, str]:
     The title is taken from the first line that starts with '**Meta Title:**'.
     If not found, falls back to the first H1 heading.
     """
-    lines = blog_content.split('\n')
-    title = ""
-    content_start = 0
-    
-    # First try to find the meta title (handle both with and without space after colon)
-    for i, line in enumerate(lines):
-        line = line.strip()
-        if line.startswith('**Meta Title:**'):
-            # Remove '**Meta Title:**' and any leading/trailing whitespace
-            title = line.replace('**Meta Title:**', '').strip()
-            content_start = i + 1
-            break
-    
-    # If no meta title found, look for the first H1 heading
-    if not title:
-        for i, line in enumerate(lines):
-            line = line.strip()
-            if line.startswith('# '):
-                title = line[2:].strip()  # Remove the '# ' prefix
-                content_start = i + 1
-                break
+    match = _META_TITLE_RE.search(blog_content) or _H1_RE.search(blog_content)
+    if not match:
+        return "", blog_content.strip()
     
     # The rest is content
-    content = '\n'.join(lines[content_start:]).strip()
+    title = match.group(1).strip()
+    content = blog_content[match.end():].strip()
     
     return title, content
 
-def safe_print(*args, **kwargs):
-    """Helper function to safely print Unicode characters in Windows"""
-    try:
-        print(*args, **kwargs)
-    except UnicodeEncodeError:
-        # If Unicode fails, replace unsupported characters
-        text = ' '.join(str(arg) for arg in args)
-        print(text.encode('ascii', 'replace').decode('ascii'), **kwargs)
-
 def generate_slug(title: str) -> str:
     """Generate a URL-friendly slug from the title"""
-    import re
-    from unidecode import unidecode
-    
     # Convert to ASCII
     slug = unidecode(title)
     # Convert to lowercase
     slug = slug.lower()
     # Remove special characters
-    slug = re.sub(r'[^\w\s-]', '', slug)
+    slug = _SLUG_STRIP.sub('', slug)
     # Replace spaces with hyphens
-    slug = re.sub(r'[\s-]+', '-', slug)
+    slug = _SLUG_DASH.sub('-', slug)
     # Remove leading/trailing hyphens
     slug = slug.strip('-_')
     return slug
@@ -276,10 +348,6 @@ def update_sitemap(slug: str) -> bool:
     </url>
 </urlset>''')
         
-        # Read current sitemap
-        with open(sitemap_path, 'r', encoding='utf-8') as f:
-            sitemap = f.read()
-        
         # Add new URL before closing urlset
         new_url = f'''
     <url>
@@ -290,51 +358,55 @@ def update_sitemap(slug: str) -> bool:
     </url>
 </urlset>'''
         
-        updated_sitemap = sitemap.replace('</urlset>', new_url)
-        
-        # Write updated sitemap
-        with open(sitemap_path, 'w', encoding='utf-8') as f:
-            f.write(updated_sitemap)
+        # Only rewrite the tail: find the closing tag through a memory map,
+        # truncate there and append the new entry plus the closing tag
+        with open(sitemap_path, 'r+b') as f:
+            pos = -1
+            if os.fstat(f.fileno()).st_size:
+                # The map must be closed before truncating (required on Windows)
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    pos = mm.rfind(b'</urlset>')
+                    trailer = mm[pos + len(b'</urlset>'):] if pos != -1 else b''
+            if pos == -1:
+                log.error("[!] Error updating sitemap: closing </urlset> tag not found")
+                return False
+            f.seek(pos)
+            f.truncate()
+            f.write(new_url.encode('utf-8') + trailer)
             
-        safe_print(f"[+] Updated sitemap with new URL: /pages/{slug}")
+        log.info("[+] Updated sitemap with new URL: /pages/%s", slug)
         return True
         
     except Exception as e:
-        safe_print(f"[!] Error updating sitemap: {str(e)}")
+        log.error("[!] Error updating sitemap: %s", e)
         return False
 
 def save_to_database(keyword: str, title: str, content: str, full_content: str) -> bool:
     """Save blog post to Turso database with title, content, and slug"""
     try:
-        safe_print("\n=== Starting database save process ===")
+        log.debug("\n=== Starting database save process ===")
         
         # Get Turso credentials from environment variables
         turso_url = os.getenv('TURSO_DATABASE_URL')
         turso_auth_token = os.getenv('TURSO_AUTH_TOKEN')
         
-        safe_print(f"Using Turso URL: {turso_url}")
-        safe_print(f"Auth token: {'*' * 20}{turso_auth_token[-4:] if turso_auth_token else 'None'}")
+        log.debug("Using Turso URL: %s", turso_url)
+        log.debug("Auth token: %s%s", '*' * 20, turso_auth_token[-4:] if turso_auth_token else 'None')
         
         if not turso_url or not turso_auth_token:
-            safe_print("[X] Error: Missing Turso credentials")
+            log.error("[X] Error: Missing Turso credentials")
             if not turso_url:
-                safe_print("- TURSO_DATABASE_URL is not set")
+                log.error("- TURSO_DATABASE_URL is not set")
             if not turso_auth_token:
-                safe_print("- TURSO_AUTH_TOKEN is not set")
+                log.error("- TURSO_AUTH_TOKEN is not set")
             return False
         
-        safe_print(f"Using title: {title}")
+        log.debug("Using title: %s", title)
         # Generate a proper URL-friendly slug
         slug = generate_slug(title)
-        safe_print(f"Generated slug: {slug}")
+        log.debug("Generated slug: %s", slug)
         
-        # Prepare the base URL and headers
-        base_url = f"https://{turso_url}" if not turso_url.startswith(('http://', 'https://')) else turso_url
-        pipeline_url = f"{base_url}/v2/pipeline"
-        headers = {
-            'Authorization': f'Bearer {turso_auth_token}',
-            'Content-Type': 'application/json'
-        }
+        client = get_client(turso_url, turso_auth_token)
         
         # Prepare the insert query with REPLACE to handle duplicates
         insert_sql = """
@@ -342,62 +414,59 @@ def save_to_database(keyword: str, title: str, content: str, full_content: str)
         VALUES (?, ?, ?)
         """.strip()
         
-        # Create the payload with proper parameter binding
-        payload = {
-            'requests': [
-                {
-                    'type': 'execute',
-                    'stmt': {
-                        'sql': insert_sql,
-                        'args': [
-                            {'type': 'text', 'value': title},
-                            {'type': 'text', 'value': full_content},
-                            {'type': 'text', 'value': slug}
-                        ]
-                    }
-                },
-                {'type': 'close'}
-            ]
-        }
+        # Use proper parameter binding and confirm the write in the same round-trip
+        statements = [
+            {
+                'sql': insert_sql,
+                'args': [
+                    {'type': 'text', 'value': title},
+                    {'type': 'text', 'value': full_content},
+                    {'type': 'text', 'value': slug}
+                ]
+            },
+            {'sql': 'SELECT last_insert_rowid() AS id'}
+        ]
         
-        safe_print("\nSending request to Turso...")
-        safe_print(f"URL: {pipeline_url}")
-        safe_print(f"SQL: {insert_sql}")
+        log.debug("\nSending request to Turso...")
+        log.debug("URL: %s", client.pipeline_url)
+        log.debug("SQL: %s", insert_sql)
         
         # Send the request to Turso's REST API
         try:
-            response = requests.post(
-                pipeline_url,
-                headers=headers,
-                data=json.dumps(payload),
-                timeout=30
-            )
-            
-            safe_print("\n=== Response from Turso ===")
-            safe_print(f"Status Code: {response.status_code}")
-            safe_print(f"Response Text: {response.text}")
-            
-            if response.status_code == 200:
-                safe_print("[+] Successfully saved to Turso database!")
-                # Update sitemap after successful save
-                update_sitemap(slug)
-                return True
-            else:
-                safe_print("[X] Failed to save to Turso database")
-                if response.status_code == 401:
-                    safe_print("Authentication failed. Please check your TURSO_AUTH_TOKEN")
-                elif response.status_code == 404:
-                    safe_print("Endpoint not found. Please check your TURSO_DATABASE_URL")
-                return False
-                
+            results = client.execute(statements)
+        except requests.exceptions.HTTPError as e:
+            log.error("[X] Failed to save to Turso database")
+            # .text decodes the body even as a lazy argument, so guard it
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Status Code: %s", e.response.status_code)
+                log.debug("Response Text: %s", e.response.text)
+            if e.response.status_code == 401:
+                log.error("Authentication failed. Please check your TURSO_AUTH_TOKEN")
+            elif e.response.status_code == 404:
+                log.error("Endpoint not found. Please check your TURSO_DATABASE_URL")
+            return False
         except requests.exceptions.RequestException as e:
-            safe_print(f"\n[X] Network error: {str(e)}")
+            log.error("\n[X] Network error: %s", e)
+            return False
+        
+        log.debug("\n=== Response from Turso ===\n%s", results)
+        
+        if not results or results[0].get('type') != 'ok':
+            error = result_error(results[0]) if results else 'empty response'
+            log.error("[X] Failed to save to Turso database: %s", error)
             return False
+        
+        rows = result_rows(results[1]) if len(results) > 1 else []
+        if rows:
+            log.debug("Inserted row id: %s", rows[0][0])
+        
+        log.info("[+] Successfully saved to Turso database!")
+        # Update sitemap after successful save
+        update_sitemap(slug)
+        return True
             
     except Exception as e:
-        safe_print(f"\n[X] Error saving to Turso database: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        log.exception("\n[X] Error saving to Turso database: %s", e)
         return False
 
 if __name__ == "__main__":
@@ -0,0 +1,17 @@
+import json
+from typing import Any
+
+# JSON codec shared by the SCRAP scripts
+try:
+    import orjson
+    json_dumps = orjson.dumps
+    json_loads = orjson.loads
+    
+    def json_dumps_pretty(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:  # orjson is optional, fall back to the stdlib encoder
+    json_dumps = json.dumps
+    json_loads = json.loads
+    
+    def json_dumps_pretty(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2).encode('utf-8')
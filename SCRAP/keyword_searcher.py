@@ -1,12 +1,24 @@
 import os
+import shutil
+import hashlib
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import sys
 import subprocess
 import time
 import random
-from typing import List, Dict, Optional, Any
-from dotenv import load_dotenv
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import suppress
+from typing import List, Dict, Optional, Any, Tuple
+from dotenv import dotenv_values
+from jsoncodec import json_loads, json_dumps_pretty
+
+try:
+    from watchdog.observers import Observer
+except ImportError:  # watchdog is optional, fall back to polling the file's mtime
+    Observer = None
 
 # --- FINAL CORRECTED CONSTANT DEFINITIONS ---
 # SCRIPT_DIR is where keyword_searcher.py is located (e.g., C:\...\liveenity\SCRAP)
@@ -16,6 +28,93 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 # This targets C:\Users\rajam\Desktop\liveenity\SCRAP
 SCRAP_DIR = SCRIPT_DIR 
 
+# Scraped pages are cached per URL so reruns skip the paid ScrapingDog call
+CACHE_DIR = os.path.join(SCRIPT_DIR, '.scrape_cache')
+SCRAPE_CACHE_TTL = 24 * 60 * 60  # 24 hours
+
+# Buffer size for scraped HTML and search result files; fewer write() calls
+# than the default 8 KiB buffer on multi-MB pages
+WRITE_BUFFER_SIZE = 128 * 1024
+
+# Shared HTTP session so repeated calls reuse the pooled HTTPS connection
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504])
+))
+_SESSION.headers.update({
+    'User-Agent': 'Liveenity-Keyword-Searcher/1.0'
+})
+
+# Separate pool for ScrapingDog so scrapes running in parallel don't compete
+# with SerpAPI calls for connections
+_scrape_session = requests.Session()
+_scrape_session.mount('https://', HTTPAdapter(
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+))
+_scrape_session.headers.update({
+    'User-Agent': 'Liveenity-Keyword-Searcher/1.0'
+})
+
+# Finished keywords are appended here instead of rewriting KEYWORDS.txt each
+# time; KEYWORDS.txt is compacted every COMPACT_EVERY keywords, whenever the
+# queue runs empty and on exit. server.js serves and rewrites KEYWORDS.txt for
+# the web UI, so finished keywords must not linger there while idle
+PROCESSED_FILE = os.path.join(SCRAP_DIR, 'PROCESSED.txt')
+COMPACT_EVERY = 20
+
+# Keywords searched ahead of processing. Each one takes 1-2 minutes, so a
+# larger window only buys paid searches that go stale or are lost on Ctrl+C
+PREFETCH_WINDOW = 4
+
+# .env in SCRAP_DIR wins over .env.local one level up
+ENV_PATHS = (
+    os.path.join(SCRAP_DIR, '.env'),
+    os.path.join(os.path.dirname(SCRAP_DIR), '.env.local'),
+)
+_ENV_PATH: Optional[str] = None
+_ENV_MTIME = 0.0
+_ENV_CACHE: Dict[str, Optional[str]] = {}
+
+# Variables blog generation needs; _MISSING_ENV is refreshed by load_env()
+_REQUIRED = ('TURSO_DATABASE_URL', 'TURSO_AUTH_TOKEN', 'GEMINI_API_KEY')
+_MISSING_ENV: Tuple[str, ...] = ()
+
+def load_env() -> Optional[str]:
+    """Load the first existing file of ENV_PATHS into os.environ.
+    
+    The parsed values are cached and the file is only parsed again when its
+    mtime changes. On first load existing environment variables win, like
+    load_dotenv(); on a reload the edited file's values are applied.
+    
+    Returns:
+        Path of the loaded file or None if none exists
+    """
+    global _ENV_PATH, _ENV_MTIME, _ENV_CACHE, _MISSING_ENV
+    for env_path in ENV_PATHS:
+        try:
+            mtime = os.stat(env_path).st_mtime
+        except OSError:
+            continue
+        if env_path == _ENV_PATH and mtime <= _ENV_MTIME:
+            return env_path
+        
+        reload = _ENV_PATH is not None
+        _ENV_CACHE = dotenv_values(env_path)
+        for key, value in _ENV_CACHE.items():
+            if value is not None and (reload or key not in os.environ):
+                os.environ[key] = value
+        _ENV_PATH, _ENV_MTIME = env_path, mtime
+        _MISSING_ENV = tuple(var for var in _REQUIRED if not os.getenv(var))
+        return env_path
+    if _ENV_PATH is None:
+        _MISSING_ENV = tuple(var for var in _REQUIRED if not os.getenv(var))
+    return None
+
+load_env()
+
 # ==============================================================================
 # PLACEHOLDER FUNCTIONS (Assumed to be in your original script)
 # ==============================================================================
@@ -52,10 +151,10 @@ class SERPSearcher:
                 'google_domain': 'google.com'
             }
             
-            response = requests.get(self.base_url, params=params, timeout=30)
+            response = _SESSION.get(self.base_url, params=params, timeout=30)
             response.raise_for_status()  # Raise an exception for HTTP errors
             
-            data = response.json()
+            data = json_loads(response.content)
             
             # Extract organic results
             results = {
@@ -86,14 +185,65 @@ class SERPSearcher:
         except Exception as e:
             print(f"Unexpected error: {e}")
             return None
+    
+    def search_keywords(self, keywords: List[str], max_workers: int = 8) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Search several keywords concurrently using SerpAPI.
+        
+        Args:
+            keywords: The search query strings
+            max_workers: Maximum number of requests in flight at once
+            
+        Returns:
+            Dict mapping each keyword to its search results (None on error)
+        """
+        if not keywords:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(len(keywords), max_workers)) as executor:
+            return dict(zip(keywords, executor.map(self.search_keyword, keywords)))
 
 def extract_top_links(results: Dict[str, Any], count: int) -> List[str]:
     """Extracts the top N links from the search results."""
     return [r['link'] for r in results.get('organic_results', [])][:count]
 
-def scrape_website(url: str) -> Optional[str]:
-    """Scrape website content using ScrapingDog API."""
+def prune_scrape_cache() -> int:
+    """Deletes cached pages older than SCRAPE_CACHE_TTL; returns how many."""
+    cutoff = time.time() - SCRAPE_CACHE_TTL
+    removed = 0
+    try:
+        with os.scandir(CACHE_DIR) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file() and entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                        removed += 1
+                except OSError:
+                    pass
+    except FileNotFoundError:
+        pass
+    return removed
+
+def scrape_website(url: str, out_path: str, session: Optional[requests.Session] = None) -> Optional[str]:
+    """Scrape website content using ScrapingDog API and stream it to out_path.
+    
+    session defaults to the module's pooled scrape session.
+    
+    Returns:
+        out_path on success or None if there was an error
+    """
+    part_path = f"{out_path}.part"
+    cache_path = os.path.join(CACHE_DIR, hashlib.sha256(url.encode('utf-8')).hexdigest() + '.html')
     try:
+        # Serve recent pages from the local cache
+        try:
+            if time.time() - os.path.getmtime(cache_path) < SCRAPE_CACHE_TTL:
+                print(f"  - Using cached copy of: {url}")
+                shutil.copyfile(cache_path, out_path)
+                return out_path
+            # Expired; drop it now rather than waiting for a successful rescrape
+            os.remove(cache_path)
+        except OSError:
+            pass
+        
         # Get API key from environment variables
         api_key = os.getenv('SCRAPINGDOG_API_KEY')
         if not api_key:
@@ -113,17 +263,30 @@ def scrape_website(url: str) -> Optional[str]:
         }
         
         # Make the request to ScrapingDog API
-        response = requests.get(
+        with (session or _scrape_session).get(
             'https://api.scrapingdog.com/scrape',
             params=params,
-            timeout=45  # Increased timeout for the request
-        )
+            timeout=45,  # Increased timeout for the request
+            stream=True
+        ) as response:
+            # Check if the request was successful
+            response.raise_for_status()
+            
+            # Stream the body to disk so only one chunk is held in memory
+            with open(part_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+                for chunk in response.iter_content(chunk_size=65536):
+                    f.write(chunk)
         
-        # Check if the request was successful
-        response.raise_for_status()
+        os.replace(part_path, out_path)
+        
+        # Keep a copy for later runs; a cache failure must not fail the scrape
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            shutil.copyfile(out_path, cache_path)
+        except OSError as e:
+            print(f"⚠️  Could not cache {url}: {e}")
         
-        # Return the scraped content
-        return response.text
+        return out_path
         
     except requests.exceptions.RequestException as e:
         print(f"❌ Error scraping {url}: {e}")
@@ -134,50 +297,135 @@ def scrape_website(url: str) -> Optional[str]:
     except Exception as e:
         print(f"❌ Unexpected error while scraping {url}: {e}")
         return None
+    finally:
+        with suppress(FileNotFoundError):
+            os.remove(part_path)
+
+class KeywordsFileWatcher:
+    """Blocks until a file changes.
+    
+    Uses watchdog (inotify on Linux, ReadDirectoryChangesW on Windows) when it
+    is installed and otherwise compares the file's mtime every poll_interval
+    seconds.
+    """
+    def __init__(self, filepath: str, poll_interval: float = 5):
+        self.filepath = os.path.abspath(filepath)
+        self.poll_interval = poll_interval
+        self._changed = threading.Event()
+        self._mtime = self._current_mtime()
+        self._observer = None
+        if Observer is not None:
+            self._observer = Observer()
+            self._observer.schedule(self, os.path.dirname(self.filepath), recursive=False)
+            self._observer.start()
+    
+    def _current_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.filepath).st_mtime
+        except OSError:
+            return None
+    
+    def dispatch(self, event) -> None:
+        """watchdog callback; flags changes to the watched file (including
+        editors that save by renaming a temp file over it)"""
+        paths = (getattr(event, 'src_path', None), getattr(event, 'dest_path', None))
+        if any(path and os.path.abspath(path) == self.filepath for path in paths):
+            self._changed.set()
+    
+    def wait(self, timeout: float = 60) -> bool:
+        """Wait up to timeout seconds for a change; True if the file changed"""
+        if self._observer is not None:
+            changed = self._changed.wait(timeout)
+            self._changed.clear()
+            return changed
+        
+        deadline = time.monotonic() + timeout
+        while True:
+            mtime = self._current_mtime()
+            if mtime != self._mtime:
+                self._mtime = mtime
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.poll_interval, remaining))
+    
+    def stop(self) -> None:
+        """Stop the watchdog observer thread, if any"""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
 
 # ==============================================================================
 # MAIN SCRIPT LOGIC
 # ==============================================================================
 
+def load_processed_keywords(processed_file: str) -> set:
+    """Loads the keywords already logged in PROCESSED.txt."""
+    if os.path.exists(processed_file):
+        with open(processed_file, 'r', encoding='utf-8') as f:
+            return {line.strip() for line in f if line.strip()}
+    return set()
+
+def mark_keyword_processed(processed_file: str, keyword: str) -> None:
+    """Appends a finished keyword to PROCESSED.txt (no rewrite of KEYWORDS.txt)."""
+    with open(processed_file, 'a', encoding='utf-8') as f:
+        f.write(f"{keyword}\n")
+
+def compact_keywords_file(keywords_file: str, processed_file: str, processed_keywords: set) -> None:
+    """Removes processed keywords from KEYWORDS.txt and empties PROCESSED.txt."""
+    try:
+        if os.path.exists(keywords_file):
+            # Case-insensitive match, also catching KEYWORD_NAME vs "keyword name"
+            targets = frozenset(
+                variant
+                for keyword in processed_keywords
+                for variant in (keyword.upper(), keyword.replace('_', ' ').strip().upper())
+            )
+            
+            # Iterate the file directly; only the kept lines are materialized
+            with open(keywords_file, 'r', encoding='utf-8') as f:
+                updated_lines = [s for s in (line.strip() for line in f)
+                                 if s and s.upper() not in targets]
+            
+            with open(keywords_file, 'w', encoding='utf-8') as f:
+                f.writelines(s + '\n' for s in updated_lines)
+        
+        # Everything logged so far is gone from KEYWORDS.txt now
+        open(processed_file, 'w', encoding='utf-8').close()
+        print(f"Compacted {keywords_file}")
+    except Exception as e:
+        print(f"Error compacting keywords file: {e}")
+
 def cleanup_files(keyword: str) -> None:
-    """Clean up search results, scraped files, and update KEYWORDS.txt"""
+    """Clean up search results and scraped files.
+    
+    KEYWORDS.txt is not touched here; processed keywords are logged to
+    PROCESSED_FILE and dropped from it by compact_keywords_file.
+    """
     try:
         # Remove search results JSON file (in SCRAP_DIR)
         json_file = f"{keyword}_results.json"
         json_file_path = os.path.join(SCRAP_DIR, json_file) 
-        if os.path.exists(json_file_path):
+        with suppress(FileNotFoundError):
             os.remove(json_file_path)
             print(f"Removed search results: {json_file}")
         
-        # Remove scraped HTML files (in SCRAP_DIR)
-        for i in range(1, 3):  # Remove link_1.html and link_2.html
-            html_file_name = f"scraped_{keyword}_link_{i}.html"
-            html_file_path = os.path.join(SCRAP_DIR, html_file_name) 
-            
-            if os.path.exists(html_file_path):
-                os.remove(html_file_path)
-                print(f"Removed scraped file: {html_file_path}")
+        # Remove scraped HTML files (in SCRAP_DIR), however many links were
+        # scraped; the index check keeps other keywords sharing the prefix safe
+        prefix = f"scraped_{keyword}_link_"
+        with os.scandir(SCRAP_DIR) as entries:
+            for entry in entries:
+                name = entry.name
+                if not (name.startswith(prefix) and name.endswith('.html')):
+                    continue
+                if not name[len(prefix):-len('.html')].isdigit():
+                    continue
+                
+                with suppress(FileNotFoundError):
+                    os.remove(entry.path)
+                    print(f"Removed scraped file: {entry.path}")
                 
-        # Remove the processed keyword from KEYWORDS.txt
-        keywords_file = os.path.join(SCRAP_DIR, 'KEYWORDS.txt')
-        
-        if os.path.exists(keywords_file):
-             with open(keywords_file, 'r', encoding='utf-8') as f:
-                 lines = f.readlines()
-             
-             keyword_with_spaces = keyword.replace('_', ' ').strip()
-             
-             updated_lines = [line.strip() for line in lines 
-                              if line.strip().upper() not in [keyword.upper(), keyword_with_spaces.upper()] 
-                              and line.strip()]
-             
-             with open(keywords_file, 'w', encoding='utf-8') as f:
-                 f.write('\n'.join(updated_lines))
-                 if updated_lines:
-                     f.write('\n')
-             
-             print(f"Removed processed keyword '{keyword}' from KEYWORDS.txt")
-
     except Exception as e:
         print(f"Error during cleanup: {e}")
 
@@ -186,56 +434,62 @@ def run_blog_generation(keyword: str) -> bool:
     try:
         print("\nGenerating blog post...")
         
-        load_dotenv()
-        
-        required_vars = ['TURSO_DATABASE_URL', 'TURSO_AUTH_TOKEN', 'GEMINI_API_KEY']
-        missing_vars = [var for var in required_vars if not os.getenv(var)]
+        # Cheap stat check; only re-parses .env if it was edited
+        load_env()
         
-        if missing_vars:
-            print(f"❌ Missing required environment variables: {', '.join(missing_vars)}")
+        if _MISSING_ENV:
+            print(f"❌ Missing required environment variables: {', '.join(_MISSING_ENV)}")
             print("Please add them to your .env file")
             return False
         
-        # --- PASS CORRECTED PATH TO EXTERNAL SCRIPT ---
-        # The external script (generate_blog.py) now receives the correct full path.
-        script_args = [sys.executable, 'generate_blog.py', keyword, SCRAP_DIR]
-        
-        # Run the blog generation with the keyword and the scrap directory path as arguments
-        result = subprocess.run(
-            script_args,
-            cwd=SCRAP_DIR, # Run from the script's directory (C:\...\SCRAP)
-            capture_output=True,
-            text=True,
-            env=os.environ
-        )
+        # USE_SUBPROCESS=1 runs generate_blog.py in its own interpreter, which
+        # is slower but isolates it when debugging
+        if os.getenv('USE_SUBPROCESS') == '1':
+            script_args = [sys.executable, 'generate_blog.py', keyword, SCRAP_DIR]
+            result = subprocess.run(
+                script_args,
+                cwd=SCRAP_DIR,
+                capture_output=True,
+                text=True,
+                env=os.environ
+            )
+            
+            if result.stdout:
+                print(result.stdout)
+            if result.stderr:
+                print("Error:", result.stderr)
+            
+            if result.returncode != 0:
+                print("❌ Failed to generate blog post")
+                return False
+            saved = "Successfully saved to Turso database" in result.stdout
+        else:
+            # Imported on first use so scraping-only callers (process_results,
+            # the subprocess path) never load the Gemini SDK
+            import generate_blog
+            
+            # Run the blog generation in-process, passing the scrap directory
+            saved = generate_blog.run(keyword, SCRAP_DIR)
         
-        if result.stdout:
-             print(result.stdout)
-        if result.stderr:
-             print("Error:", result.stderr)
-         
-        success = result.returncode == 0
-         
-        if success:
-             # Check for a successful save message
-             if "Successfully saved to Turso database" in result.stdout:
-                 print("✅ Blog post saved to Turso database")
-             else:
-                 # If subprocess succeeds but doesn't confirm DB save
-                 print("⚠️  Blog post generated but may not have been saved to Turso")
-                 print("    Check generate_blog.py output and environment variables.")
-             
-             cleanup_files(keyword)
+        if saved:
+            print("✅ Blog post saved to Turso database")
         else:
-             print("❌ Failed to generate blog post")
-             
-        return success
+            # If generation finished but didn't confirm the DB save
+            print("⚠️  Blog post generated but may not have been saved to Turso")
+            print("    Check generate_blog.py output and environment variables.")
+        
+        cleanup_files(keyword)
+        return True
     except Exception as e:
         print(f"❌ Error generating blog post: {e}")
         return False
 
-def process_keyword(keyword: str, searcher: SERPSearcher):
-    """Process a single keyword through the entire pipeline."""
+def process_keyword(keyword: str, searcher: SERPSearcher, results: Optional[Dict[str, Any]] = None):
+    """Process a single keyword through the entire pipeline.
+    
+    results may hold search results fetched ahead of time (see
+    SERPSearcher.search_keywords); otherwise the keyword is searched here.
+    """
     keyword_clean = keyword.strip()
     if not keyword_clean:
         return False
@@ -244,7 +498,8 @@ def process_keyword(keyword: str, searcher: SERPSearcher):
     print(f"\n🔍 Processing keyword: {keyword_clean}")
     
     # Search and save results
-    results = searcher.search_keyword(keyword_clean)
+    if results is None:
+        results = searcher.search_keyword(keyword_clean)
     
     if not results:
         print(f"No results found for '{keyword_clean}'")
@@ -255,8 +510,8 @@ def process_keyword(keyword: str, searcher: SERPSearcher):
     # Save search results JSON
     results_file = f"{keyword_clean_upper}_results.json"
     results_file_path = os.path.join(SCRAP_DIR, results_file)
-    with open(results_file_path, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2)
+    with open(results_file_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        f.write(json_dumps_pretty(results))
     print(f"Saved search results to {results_file_path}")
     
     top_links = extract_top_links(results, count=2)
@@ -267,37 +522,28 @@ def process_keyword(keyword: str, searcher: SERPSearcher):
     print("\nScraping top links:")
     for i, link in enumerate(top_links, 1):
         print(f"{i}. {link}")
-        scrape_result = scrape_website(link)
-        if scrape_result:
+    
+    # Scrapes are independent, blocking API calls, so run them concurrently
+    with ThreadPoolExecutor(max_workers=min(len(top_links), 8)) as executor:
+        futures = []
+        for i, link in enumerate(top_links, 1):
             filename = f"scraped_{keyword_clean_upper}_link_{i}.html"
             file_path = os.path.join(SCRAP_DIR, filename) 
-            
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(scrape_result)
-            print(f"  - Saved to {file_path}")
+            futures.append(executor.submit(scrape_website, link, file_path, _scrape_session))
+        for future in as_completed(futures):
+            saved_path = future.result()
+            if saved_path:
+                print(f"  - Saved to {saved_path}")
     
     # Generate the blog post
     return run_blog_generation(keyword_clean_upper)
 
 def main():
-    # Load environment variables
-    env_loaded = False
-    
-    # Check for .env in the same directory as the script (SCRAP_DIR)
-    env_path = os.path.join(SCRAP_DIR, '.env')
-    if os.path.exists(env_path):
-        load_dotenv(env_path)
+    # Environment variables were loaded at import; pick up any later edits
+    env_path = load_env()
+    env_loaded = env_path is not None
+    if env_loaded:
         print(f"Loaded environment variables from {env_path}")
-        env_loaded = True
-    
-    # Check for .env.local one level up (in C:\Users\rajam\Desktop\liveenity\)
-    if not env_loaded:
-        parent_dir = os.path.dirname(SCRAP_DIR)
-        env_path = os.path.join(parent_dir, '.env.local')
-        if os.path.exists(env_path):
-            load_dotenv(env_path)
-            print(f"Loaded environment variables from {env_path}")
-            env_loaded = True
     
     if not env_loaded:
         print("⚠️  No .env or .env.local file found. Some features may not work.")
@@ -321,41 +567,87 @@ def main():
 
     keywords_file = os.path.join(SCRAP_DIR, 'KEYWORDS.txt')
     searcher = SERPSearcher(API_KEY)
-    processed_keywords = set()
+    
+    # Expired pages are never served again; don't let them pile up on disk
+    removed = prune_scrape_cache()
+    if removed:
+        print(f"Removed {removed} expired page(s) from {CACHE_DIR}")
+    
+    # Finished keywords from earlier runs; drop them from KEYWORDS.txt first
+    processed_keywords = load_processed_keywords(PROCESSED_FILE)
+    if processed_keywords:
+        compact_keywords_file(keywords_file, PROCESSED_FILE, processed_keywords)
+    since_compaction = 0
+    next_allowed = 0.0
     
     print("🚀 Starting keyword processing. Press Ctrl+C to stop.")
     print(f"Monitoring file: {keywords_file}")
     print("Add one keyword per line to process them automatically.")
     
+    watcher = KeywordsFileWatcher(keywords_file)
+    
     try:
         while True:
             # Read current keywords
             with open(keywords_file, 'r', encoding='utf-8') as f:
                 current_keywords = [line.strip() for line in f if line.strip()]
             
+            # Unique new keywords, in file order
+            new_keywords = list(dict.fromkeys(k for k in current_keywords if k not in processed_keywords))
+            search_results = {}
+            
             # Process new keywords
-            for keyword in current_keywords:
-                if keyword and keyword not in processed_keywords:
-                    process_keyword(keyword, searcher)
-                    processed_keywords.add(keyword)
-                    
-                    # Remove the processed keyword from the file
-                    with open(keywords_file, 'w', encoding='utf-8') as f:
-                        f.write('\n'.join(k for k in current_keywords if k != keyword))
-                    
-                    # Add delay after successful blog generation
-                    delay_seconds = random.randint(60, 120)  # 1-2 minutes
-                    print(f"⏳ Waiting {delay_seconds} seconds before next keyword...")
-                    time.sleep(delay_seconds)
+            for i, keyword in enumerate(new_keywords):
+                # Search the next few keywords concurrently
+                if keyword not in search_results:
+                    search_results = searcher.search_keywords(
+                        new_keywords[i:i + PREFETCH_WINDOW], max_workers=PREFETCH_WINDOW
+                    )
+                
+                # Only wait for whatever is left of the delay; time spent
+                # idle or searching already counts towards it
+                wait_seconds = next_allowed - time.monotonic()
+                if wait_seconds > 0:
+                    print(f"⏳ Waiting {wait_seconds:.0f} seconds before next keyword...")
+                    time.sleep(wait_seconds)
+                
+                process_keyword(keyword, searcher, search_results.get(keyword))
+                processed_keywords.add(keyword)
+                
+                # Log the keyword as processed; KEYWORDS.txt is only
+                # rewritten every COMPACT_EVERY keywords
+                mark_keyword_processed(PROCESSED_FILE, keyword)
+                since_compaction += 1
+                if since_compaction >= COMPACT_EVERY:
+                    compact_keywords_file(keywords_file, PROCESSED_FILE, processed_keywords)
+                    since_compaction = 0
+                
+                # Set the earliest start of the next keyword (1-2 minutes)
+                next_allowed = time.monotonic() + random.randint(60, 120)
+            
+            # Queue is drained; drop finished keywords before going idle so
+            # the web UI does not show (and save back) them as pending
+            if since_compaction:
+                compact_keywords_file(keywords_file, PROCESSED_FILE, processed_keywords)
+                since_compaction = 0
+            
+            # The daemon runs for days; expire cached pages on every drain too
+            removed = prune_scrape_cache()
+            if removed:
+                print(f"Removed {removed} expired page(s) from {CACHE_DIR}")
             
-            # Short delay before checking for new keywords
-            time.sleep(5)  # Check every 5 seconds
+            # Block until KEYWORDS.txt changes instead of re-reading it on a timer
+            while not watcher.wait(timeout=60):
+                pass
             
     except KeyboardInterrupt:
         print("\n👋 Script stopped by user.")
     except Exception as e:
         print(f"\n❌ An error occurred: {e}")
     finally:
+        watcher.stop()
+        if since_compaction:
+            compact_keywords_file(keywords_file, PROCESSED_FILE, processed_keywords)
         print("✅ Processing complete. Any remaining keywords are saved in the file.")
 
 
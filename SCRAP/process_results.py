@@ -35,13 +35,9 @@ def main():
     # Scrape each link
     for i, link in enumerate(links, 1):
         print(f"\nScraping link {i}: {link}")
-        html_content = scrape_website(link)
-        
-        if html_content:
-            # Save the scraped content
-            filename = f"scraped_link_{i}.html"
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+        # Save the scraped content
+        filename = f"scraped_link_{i}.html"
+        if scrape_website(link, filename):
             print(f"  - Saved to {filename}")
         else:
             print(f"  - Failed to scrape {link}")
@@ -1,6 +1,7 @@
 import os
 import requests
 from dotenv import load_dotenv
+from turso_client import get_client, result_error
 
 def setup_blog_table():
     """Set up the blog_posts table with the correct structure"""
@@ -15,15 +16,7 @@ def setup_blog_table():
         print("❌ Error: Missing TURSO_DATABASE_URL or TURSO_AUTH_TOKEN")
         return False
     
-    # Convert libsql:// URL to https://
-    if db_url.startswith('libsql://'):
-        db_url = f"https://{db_url[9:]}"
-    
-    pipeline_url = f"{db_url}/v2/pipeline"
-    headers = {
-        'Authorization': f"Bearer {auth_token}",
-        'Content-Type': 'application/json'
-    }
+    client = get_client(db_url, auth_token)
     
     # SQL to create the table with the exact structure you want
     create_sql = """
@@ -34,31 +27,22 @@ def setup_blog_table():
     );
     """
     
-    payload = {
-        'requests': [
-            {'type': 'execute', 'stmt': {'sql': create_sql}},
-            {'type': 'close'}
-        ]
-    }
-    
     try:
-        print(f"Connecting to database at: {db_url}")
+        print(f"Connecting to database at: {client.url}")
         print("Setting up blog_posts table...")
         
-        response = requests.post(
-            pipeline_url,
-            headers=headers,
-            json=payload,
-            timeout=30
-        )
+        result = client.execute([{'sql': create_sql}])[0]
         
-        if response.status_code == 200:
+        if result.get('type') == 'ok':
             print("✅ Successfully set up blog_posts table")
             return True
         else:
-            print(f"❌ Failed to set up table: {response.status_code} - {response.text}")
+            print(f"❌ Failed to set up table: {result_error(result)}")
             return False
             
+    except requests.exceptions.HTTPError as e:
+        print(f"❌ Failed to set up table: {e.response.status_code} - {e.response.text}")
+        return False
     except Exception as e:
         print(f"❌ An error occurred: {str(e)}")
         return False
@@ -0,0 +1,81 @@
+import functools
+from typing import List, Dict, Any
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Imported as SCRAP.turso_client from the repo root, as turso_client in SCRAP
+if __package__:
+    from .jsoncodec import json_dumps, json_loads
+else:
+    from jsoncodec import json_dumps, json_loads
+
+class TursoClient:
+    """Client for Turso's HTTP pipeline API.
+
+    Owns the normalized database URL, the auth headers and a pooled
+    requests.Session, so callers only pass the statements to run.
+    """
+    def __init__(self, db_url: str, auth_token: str):
+        # Convert libsql:// URL to https:// for API calls
+        if db_url.startswith('libsql://'):
+            db_url = f"https://{db_url[9:]}"
+        elif not db_url.startswith(('http://', 'https://')):
+            db_url = f"https://{db_url}"
+
+        self.url = db_url.rstrip('/')
+        self.pipeline_url = f"{self.url}/v2/pipeline"
+
+        # Every pipeline call is a POST, which urllib3 does not retry on status
+        # by default. The statements sent here are reads, INSERT OR REPLACE on
+        # the unique slug or schema changes that tolerate re-runs, so it is safe
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 502, 503, 504],
+                allowed_methods=frozenset({'POST'})
+            )
+        ))
+        self.session.headers.update({
+            'Authorization': f"Bearer {auth_token}",
+            'Content-Type': 'application/json',
+            'User-Agent': 'Liveenity-Turso-Client/1.0'
+        })
+
+    def execute(self, stmts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run statements in a single pipeline request.
+
+        Args:
+            stmts: Statement dicts such as {'sql': ..., 'args': [...]}
+
+        Returns:
+            One result dict per statement, in order. Each has 'type' set to
+            'ok' or 'error'; SQL errors do not raise.
+
+        Raises:
+            requests.exceptions.RequestException on network or HTTP errors
+        """
+        payload = {
+            'requests': [{'type': 'execute', 'stmt': stmt} for stmt in stmts] + [{'type': 'close'}]
+        }
+        response = self.session.post(self.pipeline_url, data=json_dumps(payload), timeout=30)
+        response.raise_for_status()
+        return json_loads(response.content)['results'][:len(stmts)]
+
+def result_rows(result: Dict[str, Any]) -> List[List[Any]]:
+    """Rows of a pipeline result with each cell unwrapped to its plain value"""
+    rows = result.get('response', {}).get('result', {}).get('rows', [])
+    return [[cell.get('value') if isinstance(cell, dict) else cell for cell in row] for row in rows]
+
+def result_error(result: Dict[str, Any]) -> str:
+    """Error message of a failed pipeline result"""
+    return result.get('error', {}).get('message', '')
+
+@functools.lru_cache(maxsize=4)
+def get_client(db_url: str, auth_token: str) -> TursoClient:
+    """Process-wide TursoClient for the given credentials"""
+    return TursoClient(db_url, auth_token)
@@ -1,12 +1,42 @@
 import os
-import json
 import requests
 import sys
+import time
+import threading
 from dotenv import load_dotenv
 from pathlib import Path
+from SCRAP.turso_client import get_client, result_rows, result_error
+
+# In-process cache of found posts keyed by slug; entries expire after
+# POST_CACHE_TTL seconds so edits in Turso show up without a restart
+POST_CACHE_TTL = 60
+POST_CACHE_SIZE = 256
+_POST_CACHE = {}
+_POST_CACHE_LOCK = threading.Lock()
 
 def get_blog_post(slug):
-    """Fetch a single blog post by its slug"""
+    """Fetch a single blog post by its slug, served from cache when fresh"""
+    now = time.monotonic()
+    with _POST_CACHE_LOCK:
+        cached = _POST_CACHE.get(slug)
+    if cached and cached[0] > now:
+        return dict(cached[1])
+    
+    post = _fetch(slug)
+    
+    # Only found posts are cached, so misses and errors are retried
+    if post is not None:
+        with _POST_CACHE_LOCK:
+            _POST_CACHE.pop(slug, None)
+            if len(_POST_CACHE) >= POST_CACHE_SIZE:
+                # Dicts keep insertion order, so the first key is the oldest
+                del _POST_CACHE[next(iter(_POST_CACHE))]
+            _POST_CACHE[slug] = (now + POST_CACHE_TTL, post)
+        post = dict(post)
+    return post
+
+def _fetch(slug):
+    """Query Turso for a single blog post by its slug"""
     # Load environment variables
     env_path = Path(__file__).parent / 'SCRAP' / '.env'
     load_dotenv(env_path)
@@ -21,14 +51,7 @@ def get_blog_post(slug):
         print(f"Slug: {slug if slug else 'Not provided'}")
         return None
     
-    # Build the URL
-    base_url = f"https://{turso_url}" if not turso_url.startswith(('http://', 'https://')) else turso_url
-    pipeline_url = f"{base_url.rstrip('/')}/v2/pipeline"
-    
-    headers = {
-        'Authorization': f'Bearer {turso_auth_token}',
-        'Content-Type': 'application/json'
-    }
+    client = get_client(turso_url, turso_auth_token)
     
     # SQL to get a single post by slug
     select_sql = """
@@ -39,58 +62,30 @@ def get_blog_post(slug):
     """.strip()
     
     try:
-        # Create payload with parameterized query
-        payload = {
-            'requests': [
-                {
-                    'type': 'execute',
-                    'stmt': {
-                        'sql': select_sql,
-                        'args': [{'type': 'text', 'value': slug}]
-                    }
-                },
-                {'type': 'close'}
-            ]
-        }
-        
-        # Make the request
-        response = requests.post(
-            pipeline_url,
-            headers=headers,
-            json=payload,
-            timeout=30
-        )
+        # Run the parameterized query
+        result = client.execute([{
+            'sql': select_sql,
+            'args': [{'type': 'text', 'value': slug}]
+        }])[0]
         
-        if response.status_code != 200:
-            print(f"Error: Received status code {response.status_code} from database")
-            print(f"Response: {response.text}")
+        if result.get('type') == 'error':
+            print(f"Error: {result_error(result)}")
             return None
-            
-        result = response.json()
-        rows = result.get('results', [{}])[0].get('response', {}).get('result', {}).get('rows', [])
+        
+        rows = result_rows(result)
         
         if not rows:
             print(f"No blog post found with slug: {slug}")
             return None
             
-        # Extract column names from the result
-        columns = [col['name'] for col in result['results'][0]['response']['result']['cols']]
-        
-        # Convert the first row to a dictionary using column names
-        row = rows[0]
-        post = {}
-        
-        for idx, col_name in enumerate(columns):
-            if idx < len(row):
-                post[col_name] = row[idx].get('value') if isinstance(row[idx], dict) else row[idx]
-                
-        # For backward compatibility, ensure these keys exist
-        post['title'] = post.get('title', 'No Title')
-        post['content'] = post.get('content', 'No content available')
-        post['slug'] = post.get('slug', '')
-        
-        return post
+        # Map the selected columns to the keys callers expect
+        title, post_slug, content = rows[0]
+        return {'title': title, 'slug': post_slug, 'content': content}
         
+    except requests.exceptions.HTTPError as e:
+        print(f"Error: Received status code {e.response.status_code} from database")
+        print(f"Response: {e.response.text}")
+        return None
     except Exception as e:
         print(f"Error fetching blog post: {str(e)}")
         return None
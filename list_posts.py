@@ -3,6 +3,7 @@ import json
 import requests
 from dotenv import load_dotenv
 from pathlib import Path
+from SCRAP.turso_client import get_client, result_rows, result_error
 
 def list_blog_posts():
     """List all blog posts and their slugs"""
@@ -20,14 +21,7 @@ def list_blog_posts():
         print(f"Looking for .env at: {env_path.absolute()}")
         return
     
-    # Build the URL
-    base_url = f"https://{turso_url}" if not turso_url.startswith(('http://', 'https://')) else turso_url
-    pipeline_url = f"{base_url}/v2/pipeline"
-    
-    headers = {
-        'Authorization': f'Bearer {turso_auth_token}',
-        'Content-Type': 'application/json'
-    }
+    client = get_client(turso_url, turso_auth_token)
     
     # SQL to check if slug column exists
     check_columns_sql = """
@@ -41,99 +35,51 @@ def list_blog_posts():
     ORDER BY rowid DESC;
     """.strip()
     
+    # SQL to check if the table exists
+    check_table_sql = """
+    SELECT name FROM sqlite_master 
+    WHERE type='table' AND name='blog_posts';
+    """.strip()
+    
     try:
-        # First check if slug column exists
-        check_payload = {
-            'requests': [
-                {
-                    'type': 'execute',
-                    'stmt': {'sql': check_columns_sql}
-                },
-                {'type': 'close'}
-            ]
-        }
-        
-        response = requests.post(
-            pipeline_url,
-            headers=headers,
-            data=json.dumps(check_payload),
-            timeout=30
-        )
-        
-        has_slug = bool(response.json().get('results', [{}])[0].get('response', {}).get('result', {}).get('rows'))
-        
-        # First, check if the table exists
-        check_table_sql = """
-        SELECT name FROM sqlite_master 
-        WHERE type='table' AND name='blog_posts';
-        """.strip()
-        
-        # Create payload to check table existence
-        table_check_payload = {
-            'requests': [
-                {
-                    'type': 'execute',
-                    'stmt': {'sql': check_table_sql}
-                },
-                {'type': 'close'}
-            ]
-        }
-        
-        # Send table check request
-        table_check_response = requests.post(
-            pipeline_url,
-            headers=headers,
-            data=json.dumps(table_check_payload),
-            timeout=30
-        )
+        # Check the slug column, check the table and get all posts in one round-trip
+        results = client.execute([
+            {'sql': check_columns_sql},
+            {'sql': check_table_sql},
+            {'sql': select_sql}
+        ])
+        if len(results) < 3:
+            print(f"Error: Unexpected response from database: {results}")
+            return
         
-        table_check_result = table_check_response.json()
-        table_exists = bool(table_check_result.get('results', [{}])[0].get('response', {}).get('result', {}).get('rows', []))
+        has_slug = bool(result_rows(results[0]))
+        table_exists = bool(result_rows(results[1]))
         
         if not table_exists:
             print("The 'blog_posts' table does not exist in the database.")
             return
-            
-        # Get all posts
-        payload = {
-            'requests': [
-                {
-                    'type': 'execute',
-                    'stmt': {'sql': select_sql}
-                },
-                {'type': 'close'}
-            ]
-        }
         
-        response = requests.post(
-            pipeline_url,
-            headers=headers,
-            data=json.dumps(payload),
-            timeout=30
-        )
-        
-        if response.status_code != 200:
-            print(f"Error: Received status code {response.status_code} from database")
-            print(f"Response: {response.text}")
+        if results[2].get('type') == 'error':
+            print(f"Error: {result_error(results[2])}")
             return
             
-        result = response.json()
-        print("\n=== Debug: Raw Database Response ===")
-        print(json.dumps(result, indent=2))
-        print("=" * 50 + "\n")
+        # Dumping the whole table is expensive; only do it when asked to
+        if os.getenv('LIST_POSTS_DEBUG'):
+            print("\n=== Debug: Raw Database Response ===")
+            print(json.dumps(results, indent=2))
+            print("=" * 50 + "\n")
         
-        rows = result.get('results', [{}])[0].get('response', {}).get('result', {}).get('rows', [])
+        # Values come back unwrapped from the database response objects
+        rows = result_rows(results[2])
         
         if not rows:
             print("No blog posts found in the 'blog_posts' table.")
             return
-            
+        
         print("\n📝 Blog Posts\n" + "="*50)
-        for row in rows:
-            # Extract values from the database response objects
-            title = row[0].get('value') if isinstance(row[0], dict) else row[0]
-            slug = (row[1].get('value') if isinstance(row[1], dict) else row[1]) if has_slug and len(row) > 1 else "[No slug]"
-            preview = (row[2].get('value') if isinstance(row[2], dict) else row[2]) if len(row) > 2 else ""
+        for title, slug, preview in rows:
+            if not has_slug:
+                slug = "[No slug]"
             
             # Format and print the post information
             print(f"\n📌 Title: {title}")
@@ -149,6 +95,9 @@ def list_blog_posts():
                 print(f"\n📄 Preview:\n{preview}")
             print("\n" + "─" * 50)
             
+    except requests.exceptions.HTTPError as e:
+        print(f"Error: Received status code {e.response.status_code} from database")
+        print(f"Response: {e.response.text}")
     except Exception as e:
         print(f"Error: {str(e)}")
 